@@ -0,0 +1,82 @@
+# =============================================================================
+# File: blacklist_snapshot.py
+# Author: deArrudal
+# Description: Saves and loads a precomputed Bloom filter for the last good
+# blacklist, so the monitor can start capturing without rebuilding it.
+# Created: 2026-10-19
+# License: GPL-3.0 License
+# =============================================================================
+
+import os
+import json
+import logging
+
+from bitarray import bitarray
+from bloom_filter import BloomFilter
+
+# Paths
+SNAPSHOT_FILE = "/opt/blacklist_monitor/resources/blacklists/blacklist_bloom.snapshot"
+
+# Constants
+SNAPSHOT_VERSION = 1
+LOGGER = logging.getLogger(__name__)
+
+
+# Identify the blacklist file the snapshot was built from, taken from the
+# open file the IPs are read from so both always describe the same inode
+def source_signature(file):
+    stats = os.fstat(file.fileno())
+    return {"mtime_ns": stats.st_mtime_ns, "size": stats.st_size}
+
+
+# Write the Bloom filter bits next to the blacklist (header line + raw bits)
+def save_snapshot(bloom_filter, signature, snapshot_path=SNAPSHOT_FILE):
+    temp = f"{snapshot_path}.tmp"
+
+    header = {
+        "version": SNAPSHOT_VERSION,
+        "items_count": bloom_filter.items_count,
+        "fp_prob": bloom_filter.fp_prob,
+        "source": signature,
+    }
+
+    try:
+        with open(temp, "wb") as file:
+            file.write(json.dumps(header).encode("utf-8") + b"\n")
+            file.write(bloom_filter.bit_array.tobytes())
+
+        os.replace(temp, snapshot_path)
+        LOGGER.info(f"Saved Bloom filter snapshot to {snapshot_path}")
+
+    except Exception as e:
+        LOGGER.warning(f"Failed to save Bloom filter snapshot: {e}")
+
+
+# Load the Bloom filter if the snapshot matches the loaded blacklist file
+def load_snapshot(signature, items_count, snapshot_path=SNAPSHOT_FILE):
+    if not os.path.exists(snapshot_path):
+        LOGGER.info("No Bloom filter snapshot found")
+        return None
+
+    try:
+        with open(snapshot_path, "rb") as file:
+            header = json.loads(file.readline().decode("utf-8"))
+
+            if (
+                header.get("version") != SNAPSHOT_VERSION
+                or header.get("items_count") != items_count
+                or header.get("source") != signature
+            ):
+                LOGGER.info("Bloom filter snapshot is stale")
+                return None
+
+            bits = bitarray()
+            bits.frombytes(file.read())
+
+        bloom_filter = BloomFilter.from_bits(bits, items_count, header["fp_prob"])
+        LOGGER.info(f"Loaded Bloom filter snapshot from {snapshot_path}")
+        return bloom_filter
+
+    except Exception as e:
+        LOGGER.warning(f"Failed to load Bloom filter snapshot: {e}")
+        return None
@@ -30,6 +30,24 @@ class BloomFilter:
         self.bit_array = bitarray(self.size)
         self.bit_array.setall(0)
 
+    # Rebuild a Bloom filter from a precomputed bit array (see blacklist_snapshot.py)
+    @classmethod
+    def from_bits(cls, bits, items_count, fp_prob=DEFAULT_FP_PROB):
+        bloom_filter = cls.__new__(cls)
+        bloom_filter.items_count = items_count
+        bloom_filter.fp_prob = fp_prob
+        bloom_filter.size = bloom_filter._get_size(items_count, fp_prob)
+        bloom_filter.hash_count = bloom_filter._get_hash_count(
+            bloom_filter.size, items_count
+        )
+
+        # Bits are byte-padded on disk, so trim back to the computed size
+        if len(bits) < bloom_filter.size:
+            raise ValueError("Bit array shorter than expected Bloom filter size")
+        bloom_filter.bit_array = bits[: bloom_filter.size]
+
+        return bloom_filter
+
     # Add an item to the Bloom filter
     def add(self, item):
         for index in self._hashes(item):
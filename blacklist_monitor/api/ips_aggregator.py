@@ -9,21 +9,23 @@
 import os
 import logging
 import re
+import shutil
 
 # Paths
 TARGET_DIR = "/opt/blacklist_monitor/resources/blacklists"
 BLACKLIST_FILE = "/opt/blacklist_monitor/resources/blacklists/blacklist_ips.txt"
 BLACKLIST_OLD_FILE = "/opt/blacklist_monitor/resources/blacklists/blacklist_ips.old"
+BLACKLIST_TEMP_FILE = "/opt/blacklist_monitor/resources/blacklists/blacklist_ips.tmp"
 
 # Constants
 IPV4_PATTERN = re.compile(r"^(?:[0-9]{1,3}\.){3}[0-9]{1,3}")
 LOGGER = logging.getLogger(__name__)
 
 
-# Backup blacklist_ips.txt file if it exists
+# Backup blacklist_ips.txt file if it exists (kept in place for the monitor)
 def set_backup():
     if os.path.exists(BLACKLIST_FILE):
-        os.rename(BLACKLIST_FILE, BLACKLIST_OLD_FILE)
+        shutil.copy2(BLACKLIST_FILE, BLACKLIST_OLD_FILE)
         LOGGER.info("Backup file created")
 
     else:
@@ -42,6 +44,7 @@ def restore_backup():
 
 
 # Aggregate all IPs from .txt blacklist files into blacklist_ips.txt
+# Returns True if a new list was written, False if the backup was restored
 def aggregate_ips():
     ip_set = set()
 
@@ -56,11 +59,12 @@ def aggregate_ips():
 
         # Loop through IPs files
         for entry in os.listdir(TARGET_DIR):
-            if not entry.endswith(".txt"):
-                continue
-
             filepath = os.path.join(TARGET_DIR, entry)
 
+            # Skip non-source files, including the current aggregate itself
+            if not entry.endswith(".txt") or filepath == BLACKLIST_FILE:
+                continue
+
             try:
                 with open(filepath, "r", encoding="utf-8") as file:
                     for line in file:
@@ -78,11 +82,14 @@ def aggregate_ips():
             LOGGER.critical("No IPs found in blacklist files")
             raise ValueError("No IPs found in blacklist files")
 
-        # Save IPs set in blacklist_ips.txt file
-        with open(BLACKLIST_FILE, "w", encoding="utf-8") as file:
+        # Save IPs set in blacklist_ips.txt file, replacing it atomically
+        with open(BLACKLIST_TEMP_FILE, "w", encoding="utf-8") as file:
             file.writelines(f"{ip}\n" for ip in ip_set)
 
+        os.replace(BLACKLIST_TEMP_FILE, BLACKLIST_FILE)
+
         LOGGER.info(f"Aggregated {len(ip_set)} unique IPs into {BLACKLIST_FILE}")
+        return True
 
     except Exception as e:
         LOGGER.error(f"Failed during Ip aggregation: {e}")
@@ -90,6 +97,7 @@ def aggregate_ips():
         # Fallback: Revert blacklist_ips.old and use as set
         try:
             restore_backup()
+            return False
 
         except Exception as fallback_error:
             LOGGER.critical(f"Failed to restore backup: {fallback_error}")
@@ -0,0 +1,144 @@
+# =============================================================================
+# File: log_handlers.py
+# Author: deArrudal
+# Description: Non-blocking queue handlers and rotating writers for logging.
+# Created: 2026-10-19
+# License: GPL-3.0 License
+# =============================================================================
+
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import time
+
+# Constants
+AUDIT_LOGGER_NAME = "blacklist_monitor.audit"
+STOP_TIMEOUT = 2
+LOGGER = logging.getLogger(__name__)
+
+
+# Queue handler that never blocks the caller, counting records lost when full
+# Drop notices go to report_handler (itself by default)
+class DroppingQueueHandler(logging.handlers.QueueHandler):
+    def __init__(self, log_queue, name, report_handler=None):
+        super().__init__(log_queue)
+        self.set_name(name)
+        self.report_handler = report_handler or self
+        self.dropped = 0
+        self.reported = 0
+
+    # Merge the message args now so later changes to them are not logged,
+    # but leave the full formatting to the writer thread
+    def prepare(self, record):
+        record.msg = record.getMessage()
+        record.args = None
+        return record
+
+    # Called with the handler lock held (see logging.Handler.handle)
+    def enqueue(self, record):
+        try:
+            self.queue.put_nowait(record)
+
+        except queue.Full:
+            self.dropped += 1
+            return
+
+        # Queue has room again, report records lost since the last notice
+        if self.dropped != self.reported:
+            self.report_dropped()
+
+    # Send a warning with the number of records lost since the last notice
+    def report_dropped(self):
+        message = (
+            f"{self.name} log queue full, dropped "
+            f"{self.dropped - self.reported} records ({self.dropped} total)"
+        )
+
+        # Built directly so the notice bypasses logger levels and handlers
+        filename, lineno, func, _ = LOGGER.findCaller()
+        record = LOGGER.makeRecord(
+            LOGGER.name, logging.WARNING, filename, lineno, message, None, None, func
+        )
+        self.reported = self.dropped
+        self.report_handler.handle(record)
+
+
+# Queue listener that waits for room for its stop sentinel on a bounded queue
+class BoundedQueueListener(logging.handlers.QueueListener):
+    def enqueue_sentinel(self):
+        self.queue.put(self._sentinel, timeout=STOP_TIMEOUT)
+
+
+# Rotate on whichever comes first: the time interval or the size limit
+class SizedTimedRotatingFileHandler(logging.handlers.TimedRotatingFileHandler):
+    def __init__(self, filename, max_bytes, **kwargs):
+        super().__init__(filename, **kwargs)
+        self.max_bytes = max_bytes
+
+    def shouldRollover(self, record):
+        if super().shouldRollover(record):
+            return True
+
+        if self.stream is None:
+            self.stream = self._open()
+
+        return self.stream.tell() >= self.max_bytes
+
+    # Size rollovers within one interval get an increasing, zero-padded counter,
+    # so backups sort in time order
+    def rotation_filename(self, default_name):
+        name = super().rotation_filename(default_name)
+        directory, base = os.path.split(name)
+        prefix = f"{base}."
+
+        indexes = [
+            int(entry[len(prefix) :])
+            for entry in os.listdir(directory)
+            if entry.startswith(prefix) and entry[len(prefix) :].isdigit()
+        ]
+
+        if not indexes and not os.path.exists(name):
+            return name
+
+        return f"{name}.{max(indexes, default=0) + 1:04d}"
+
+    # Prune backups ourselves, the stdlib suffix matching differs between
+    # Python versions and may skip the counter suffixes
+    def getFilesToDelete(self):
+        directory, base = os.path.split(self.baseFilename)
+        prefix = f"{base}."
+
+        backups = sorted(
+            os.path.join(directory, entry)
+            for entry in os.listdir(directory)
+            if entry.startswith(prefix) and self._is_backup(entry[len(prefix) :])
+        )
+
+        if len(backups) <= self.backupCount:
+            return []
+
+        return backups[: len(backups) - self.backupCount]
+
+    # Backup suffixes are the rollover time, optionally followed by a counter
+    def _is_backup(self, suffix):
+        timestamp, _, index = suffix.partition(".")
+
+        if index and not index.isdigit():
+            return False
+
+        try:
+            time.strptime(timestamp, self.suffix)
+            return True
+
+        except ValueError:
+            return False
+
+
+# Compact one-line JSON for match events
+class AuditFormatter(logging.Formatter):
+    def format(self, record):
+        event = {"ts": round(record.created, 3), "event": record.getMessage()}
+        event.update(getattr(record, "audit", {}))
+        return json.dumps(event, separators=(",", ":"))
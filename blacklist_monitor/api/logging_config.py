@@ -6,17 +6,93 @@
 # License: GPL-3.0 License
 # =============================================================================
 
+import atexit
 import logging
+import logging.handlers
 import os
+import queue
+
+from log_handlers import (
+    AUDIT_LOGGER_NAME,
+    AuditFormatter,
+    BoundedQueueListener,
+    DroppingQueueHandler,
+    SizedTimedRotatingFileHandler,
+)
 
 # Paths
 LOG_PATH = "/var/log/blacklist_monitor/main.log"
+AUDIT_LOG_PATH = "/var/log/blacklist_monitor/audit.jsonl"
+
+# Constants
+LOG_FORMAT = "%(asctime)s - %(levelname)s - %(filename)s:%(lineno)d - %(message)s"
 
-# Ensure the blacklist directory exists
+QUEUE_SIZE = 10_000
+LOG_MAX_BYTES = 10 * 1024 * 1024
+AUDIT_MAX_BYTES = 10 * 1024 * 1024
+AUDIT_ROTATE_WHEN = "midnight"
+BACKUP_COUNT = 5
+
+
+# Ensure the log directory exists
 os.makedirs(os.path.dirname(LOG_PATH), exist_ok=True)
 
-logging.basicConfig(
-    filename=LOG_PATH,
-    level=logging.INFO,
-    format="%(asctime)s - %(levelname)s - %(filename)s:%(lineno)d - %(message)s",
+# Background writers for the main log and the audit stream
+main_handler = logging.handlers.RotatingFileHandler(
+    LOG_PATH, maxBytes=LOG_MAX_BYTES, backupCount=BACKUP_COUNT
+)
+main_handler.setFormatter(logging.Formatter(LOG_FORMAT))
+
+audit_handler = SizedTimedRotatingFileHandler(
+    AUDIT_LOG_PATH,
+    max_bytes=AUDIT_MAX_BYTES,
+    when=AUDIT_ROTATE_WHEN,
+    backupCount=BACKUP_COUNT,
+)
+audit_handler.setFormatter(AuditFormatter())
+
+# Audit drop notices go to main.log so audit.jsonl only holds match events
+main_queue_handler = DroppingQueueHandler(queue.Queue(QUEUE_SIZE), "main")
+audit_queue_handler = DroppingQueueHandler(
+    queue.Queue(QUEUE_SIZE), "audit", report_handler=main_queue_handler
 )
+
+main_listener = BoundedQueueListener(main_queue_handler.queue, main_handler)
+audit_listener = BoundedQueueListener(audit_queue_handler.queue, audit_handler)
+
+logging.basicConfig(level=logging.INFO, handlers=[main_queue_handler])
+
+# Match events bypass the main log and go only to the audit stream
+audit_logger = logging.getLogger(AUDIT_LOGGER_NAME)
+audit_logger.addHandler(audit_queue_handler)
+audit_logger.propagate = False
+
+main_listener.start()
+audit_listener.start()
+
+
+# Stop a listener, workers may keep the queue full while the process exits
+def stop_listener(listener):
+    try:
+        listener.stop()
+
+    except queue.Full:
+        logging.getLogger(__name__).warning("Log queue still full at shutdown")
+
+
+# Flush pending records and log the total lost records on exit
+def shutdown_logging():
+    stop_listener(audit_listener)
+
+    if audit_queue_handler.dropped != audit_queue_handler.reported:
+        audit_queue_handler.report_dropped()
+
+    stop_listener(main_listener)
+
+    # The main listener is stopped, so write the last notice directly
+    if main_queue_handler.dropped != main_queue_handler.reported:
+        main_queue_handler.report_handler = main_handler
+        main_queue_handler.report_dropped()
+
+
+atexit.register(shutdown_logging)
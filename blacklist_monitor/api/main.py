@@ -6,32 +6,99 @@
 # License: GPL-3.0 License
 # =============================================================================
 
+import os
+import signal
+import time
 import logging
+import threading
 import logging_config  # noqa: F401
 
 from ipc_manager import setup_notification_pipe
-from blacklists_fetcher import fetch_blacklists
-from ips_aggregator import aggregate_ips
-from ports_monitor import monitor_ports
 
+# Heavy modules (pcapy, dpkt, mmh3, bitarray) are imported lazily below so the
+# entry point does not pay for them before they are needed
+
+# Paths
+BLACKLIST_FILE = "/opt/blacklist_monitor/resources/blacklists/blacklist_ips.txt"
 
 # Constants
 LOGGER = logging.getLogger(__name__)
+STARTED_AT = time.monotonic()
+
+# Start capturing against the last good blacklist and refresh in background
+FAST_START = os.environ.get("BLACKLIST_FAST_START", "1") == "1"
+
+
+# Download and consolidate the blacklists (blocking), True if a new list was set
+def update_blacklists():
+    from blacklists_fetcher import fetch_blacklists
+    from ips_aggregator import aggregate_ips
+
+    LOGGER.info("Fetching blacklists")
+    fetch_blacklists()
+
+    LOGGER.info("Consolidating blacklisted IPs")
+    return aggregate_ips()
+
+
+# Refresh the blacklists and swap them into the running monitor
+def refresh_blacklists():
+    try:
+        if not update_blacklists():
+            LOGGER.warning("Background blacklist refresh kept the previous list")
+            return
+
+        from ports_monitor import reload_blacklist
+
+        reload_blacklist()
+        LOGGER.info("Background blacklist refresh complete")
+
+    except Exception as e:
+        LOGGER.error(f"Background blacklist refresh failed: {e}")
+
+
+# Load the last good blacklist, returns False if unavailable
+def load_last_blacklist():
+    # Import errors (e.g. missing pcapy) must not look like a bad blacklist
+    from ports_monitor import reload_blacklist
+
+    if not os.path.exists(BLACKLIST_FILE):
+        LOGGER.warning(f"No previous blacklist found at {BLACKLIST_FILE}")
+        return False
+
+    try:
+        reload_blacklist()
+        return True
+
+    except Exception as e:
+        LOGGER.warning(f"Failed to load previous blacklist: {e}")
+        return False
+
+
+# systemd stops the service with SIGTERM, exit normally so atexit flushes logs
+def handle_sigterm(signum, frame):
+    LOGGER.info("Received SIGTERM, shutting down")
+    raise SystemExit(0)
 
 
 def main():
+    signal.signal(signal.SIGTERM, handle_sigterm)
+
     try:
         LOGGER.info("Initialize notification pipe")
         setup_notification_pipe()
 
-        LOGGER.info("Fetching blacklists")
-        fetch_blacklists()
+        if FAST_START and load_last_blacklist():
+            LOGGER.info("Starting background blacklist refresh")
+            threading.Thread(target=refresh_blacklists, daemon=True).start()
+
+        else:
+            update_blacklists()
 
-        LOGGER.info("Consolidating blacklisted IPs")
-        aggregate_ips()
+        from ports_monitor import monitor_ports
 
         LOGGER.info("Starting port monitor")
-        monitor_ports()
+        monitor_ports(started_at=STARTED_AT)
 
     except Exception as e:
         LOGGER.error(f"Error in execution: {e}")
@@ -8,6 +8,7 @@
 # =============================================================================
 
 import threading
+import time
 import pcapy
 import dpkt
 import socket
@@ -16,7 +17,9 @@ import json
 
 from queue import Queue
 from bloom_filter import BloomFilter
+from blacklist_snapshot import load_snapshot, save_snapshot, source_signature
 from ipc_manager import NOTIFICATION_PIPE_PATH
+from log_handlers import AUDIT_LOGGER_NAME
 
 # Paths
 BLACKLIST_FILE = "/opt/blacklist_monitor/resources/blacklists/blacklist_ips.txt"
@@ -24,6 +27,7 @@ BLACKLIST_FILE = "/opt/blacklist_monitor/resources/blacklists/blacklist_ips.txt"
 # Constants
 DEFAULT_NOTIFICATION_TYPE = "information"
 LOGGER = logging.getLogger(__name__)
+AUDIT_LOGGER = logging.getLogger(AUDIT_LOGGER_NAME)
 
 SNAP_LEN = 65536
 PROMISCUOUS = 1
@@ -32,6 +36,13 @@ TIMEOUT_MS = 0
 WORKER_COUNT = 5
 packet_queue = Queue()
 
+# (ip_set, bloom_filter) shared by the workers, swapped on refresh
+active_blacklist = None
+
+# Time-to-first-packet-inspected is logged once
+first_packet_inspected = threading.Event()
+first_packet_lock = threading.Lock()
+
 
 # Send notification to user via IPC pipe
 def notify(message, type="information"):
@@ -83,23 +94,40 @@ def process_packet(data, ip_set, bloom_filter):
             if src_ip in ip_set:
                 # TODO: Add to firewall rule
                 notify(f"Suspicious IP detected: {src_ip}, Port: {port}", "warning")
-                LOGGER.warning(f"Suspicious IP detected: {src_ip}, Port: {port}")
+                AUDIT_LOGGER.warning(
+                    "blacklist_match", extra={"audit": {"src_ip": src_ip, "port": port}}
+                )
 
     except Exception as e:
         LOGGER.error(f"Packet error: {e}")
 
 
+# Log the elapsed time between process start and the first inspected packet
+def log_first_packet(started_at):
+    with first_packet_lock:
+        if first_packet_inspected.is_set():
+            return
+
+        first_packet_inspected.set()
+        elapsed = time.monotonic() - started_at
+        LOGGER.info(f"Time to first packet inspected: {elapsed:.3f}s")
+
+
 # Worker threads
-def packet_worker(ip_set, bloom_filter):
+def packet_worker(started_at):
     while True:
         # Get packet from queue
         data = packet_queue.get()
         if data is None:
             break
 
-        # Process packet
+        # Process packet against the current blacklist
+        ip_set, bloom_filter = active_blacklist
         process_packet(data, ip_set, bloom_filter)
 
+        if not first_packet_inspected.is_set():
+            log_first_packet(started_at)
+
         packet_queue.task_done()
 
 
@@ -121,33 +149,51 @@ def monitor(interface):
         LOGGER.error(f"Monitor error on interface {interface}: {e}")
 
 
-# Load the blacklisted IPs
+# Load the blacklisted IPs and the signature of the file they were read from
 def load_blacklist(filepath):
     with open(filepath, encoding="utf-8") as file:
-        return {line.strip() for line in file if line.strip()}
+        signature = source_signature(file)
+        return {line.strip() for line in file if line.strip()}, signature
 
 
-def monitor_ports():
-    try:
-        # Load the blacklisted IPs
-        ip_set = load_blacklist(BLACKLIST_FILE)
-        LOGGER.info(f"Loaded IP blacklist from {BLACKLIST_FILE}")
+# Load the blacklisted IPs and swap them in for the packet workers
+def reload_blacklist(filepath=BLACKLIST_FILE):
+    global active_blacklist
 
-        if not ip_set:
-            LOGGER.error("Blacklist file return an empty IP list")
-            raise Exception("Blacklist file return an empty IP list")
+    ip_set, signature = load_blacklist(filepath)
+    LOGGER.info(f"Loaded IP blacklist from {filepath}")
 
+    if not ip_set:
+        LOGGER.error("Blacklist file return an empty IP list")
+        raise Exception("Blacklist file return an empty IP list")
+
+    # Reuse the precomputed bloom filter when it matches the blacklist file
+    bloom_filter = load_snapshot(signature, len(ip_set))
+
+    if bloom_filter is None:
         # Populate bloom filter with loaded IPs
         bloom_filter = BloomFilter(items_count=len(ip_set))
         for ip in ip_set:
             bloom_filter.add(ip)
         LOGGER.info("Bloom filter populated")
 
+        save_snapshot(bloom_filter, signature)
+
+    active_blacklist = (ip_set, bloom_filter)
+
+
+def monitor_ports(started_at=None):
+    if started_at is None:
+        started_at = time.monotonic()
+
+    try:
+        # Load the blacklisted IPs unless the caller already did
+        if active_blacklist is None:
+            reload_blacklist()
+
         # Start packet processing workers
         for worker in range(WORKER_COUNT):
-            t = threading.Thread(
-                target=packet_worker, args=(ip_set, bloom_filter), daemon=True
-            )
+            t = threading.Thread(target=packet_worker, args=(started_at,), daemon=True)
             t.start()
 
         # Obtain the list of available network devices
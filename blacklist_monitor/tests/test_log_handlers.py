@@ -0,0 +1,57 @@
+import logging
+import os
+
+from log_handlers import AuditFormatter, SizedTimedRotatingFileHandler
+
+
+def write_matches(handler, count):
+    for port in range(count):
+        record = logging.makeLogRecord(
+            {"msg": "blacklist_match", "audit": {"src_ip": "1.2.3.4", "port": port}}
+        )
+        handler.handle(record)
+
+
+def read_ports(path):
+    with open(path, encoding="utf-8") as file:
+        return [int(line.split('"port":')[1].rstrip("}\n")) for line in file]
+
+
+def test_size_rollovers_keep_newest_backups(tmp_path):
+    log_path = tmp_path / "audit.jsonl"
+    handler = SizedTimedRotatingFileHandler(
+        str(log_path), max_bytes=100, when="midnight", backupCount=3
+    )
+    handler.setFormatter(AuditFormatter())
+
+    write_matches(handler, 40)
+    handler.close()
+
+    backups = sorted(p for p in os.listdir(tmp_path) if p != "audit.jsonl")
+    assert len(backups) == 3
+
+    # Backups and the live file together hold the most recent matches in order
+    ports = [port for name in backups for port in read_ports(tmp_path / name)]
+    ports += read_ports(log_path)
+    assert ports == list(range(40 - len(ports), 40))
+
+
+def test_pruning_ignores_unrelated_files(tmp_path):
+    log_path = tmp_path / "audit.jsonl"
+    handler = SizedTimedRotatingFileHandler(
+        str(log_path), max_bytes=100, when="midnight", backupCount=1
+    )
+
+    for name in (
+        "audit.jsonl.2026-01-01",
+        "audit.jsonl.2026-01-01.0001",
+        "audit.jsonl.2026-01-02",
+        "audit.jsonl.notes",
+        "audit.jsonl.2026-01-01.old",
+    ):
+        (tmp_path / name).write_text("")
+
+    to_delete = [os.path.basename(path) for path in handler.getFilesToDelete()]
+    handler.close()
+
+    assert to_delete == ["audit.jsonl.2026-01-01", "audit.jsonl.2026-01-01.0001"]